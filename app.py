@@ -1,10 +1,17 @@
+import dotenv
+
+# Load .env once, before any module reads its configuration at import time
+dotenv.load_dotenv()
+
 from fastapi import FastAPI, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from utils.redisCache import lifespan, get_cache
+from utils.llmCache import AgentError
 from routes.stockRoutes import router as stock_router
 from routes.agentRoutes import router as agent_router
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"], 
@@ -14,4 +21,9 @@ app.add_middleware(
 )
 
 app.include_router(stock_router)
-app.include_router(agent_router)
\ No newline at end of file
+app.include_router(agent_router)
+
+@app.exception_handler(AgentError)
+async def agent_error_handler(request: Request, exc: AgentError):
+    # Only agent failures carry their message to the client; anything else stays a generic 500
+    return ORJSONResponse(status_code=500, content={"error": str(exc)})
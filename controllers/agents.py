@@ -1,8 +1,6 @@
 import os
-from dotenv import load_dotenv
 
 # AI assistant imports
-from agno.agent import Agent
 from agno.models.nebius import Nebius
 from agno.tools.yfinance import YFinanceTools
 from agno.tools.duckduckgo import DuckDuckGoTools
@@ -53,6 +51,7 @@ financial_agent = Agent(
 )
 
 multi_ai = Agent(
+    name="multi_ai",
     team=[web_search_agent, financial_agent],
     model=Nebius(id="meta-llama/Llama-3.3-70B-Instruct", api_key=NEBIUS_API_KEY),
     markdown=True,
@@ -1,9 +1,7 @@
 import os
-from dotenv import load_dotenv
 from agno.agent import Agent
 from agno.models.nebius import Nebius
-
-load_dotenv()
+from utils.llmCache import llm_cache, agent_cache_params
 
 NEBIUS_API_KEY = os.getenv("NEBIUS_API_KEY")
 
@@ -12,6 +10,7 @@ if not NEBIUS_API_KEY:
 
 # Create agent for chat functionality
 chat_agent = Agent(
+    name="chat_agent",
     model=Nebius(id="meta-llama/Llama-3.3-70B-Instruct", api_key=NEBIUS_API_KEY),
     instructions=[
         "You are an AI investment assistant.",
@@ -26,8 +25,12 @@ def nebius_chat(query: str):
         return {"error": "Query parameter is required"}
     
     try:
-        response = chat_agent.run(query)
-        answer = response.content
+        name, model_id, system = agent_cache_params(chat_agent)
+        answer = llm_cache.get(name, model_id, query, system)
+        if answer is None:
+            response = chat_agent.run(query)
+            answer = response.content
+            llm_cache.set(name, model_id, query, answer, system)
         return {"question": query, "answer": answer}
     
     except Exception as e:
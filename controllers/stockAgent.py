@@ -1,25 +1,15 @@
-from fastapi import FastAPI, Query, HTTPException
-from fastapi.responses import JSONResponse
 from agno.agent import Agent, RunResponse
 from agno.tools.yfinance import YFinanceTools
 from agno.models.nebius import Nebius
-import json
+import orjson
 import re
 import os
-import dotenv
 
-dotenv.load_dotenv()
 NEBIUS_API_KEY = os.getenv("NEBIUS_API_KEY")
 
 if not NEBIUS_API_KEY:
     raise ValueError("Please provide a NEBIUS API key")
 
-app = FastAPI(
-    title="Stock Analysis API",
-    description="API for fetching detailed stock analysis information",
-    version="1.0.0"
-)
-
 # Create detailed instructions for response formatting
 detailed_instructions = [
     "You are a Wall Street analyst expert. Your task is to retrieve financial data about stocks.",
@@ -73,6 +63,9 @@ stock_analyzer_agent = Agent(
     instructions=detailed_instructions,
 )
 
+_CODE_BLOCK_RE = re.compile(r'```(?:json)?\s*([\s\S]*?)\s*```')
+_JSON_OBJECT_RE = re.compile(r'\{[\s\S]*\}')
+
 def extract_json_from_response(response_content):
     """Extract JSON from response content, handling markdown code blocks."""
     if not response_content:
@@ -85,26 +78,26 @@ def extract_json_from_response(response_content):
     # If response is a string, try to extract JSON
     if isinstance(response_content, str):
         # Case 1: Check if content is wrapped in markdown code block
-        json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', response_content)
+        json_match = _CODE_BLOCK_RE.search(response_content)
         if json_match:
             json_str = json_match.group(1)
             try:
-                return json.loads(json_str)
-            except json.JSONDecodeError:
+                return orjson.loads(json_str)
+            except orjson.JSONDecodeError:
                 print(f"Failed to parse JSON from markdown code block")
         
         # Case 2: Check if the entire string is JSON
         try:
-            return json.loads(response_content)
-        except json.JSONDecodeError:
+            return orjson.loads(response_content)
+        except orjson.JSONDecodeError:
             pass
             
         # Case 3: Look for JSON object pattern in text
-        json_match = re.search(r'\{[\s\S]*\}', response_content)
+        json_match = _JSON_OBJECT_RE.search(response_content)
         if json_match:
             try:
-                return json.loads(json_match.group(0))
-            except json.JSONDecodeError:
+                return orjson.loads(json_match.group(0))
+            except orjson.JSONDecodeError:
                 print(f"Failed to parse JSON from pattern match")
                 
     return None
@@ -140,6 +133,11 @@ def create_default_stock_data(symbol):
         }
     }
 
+_NUMERIC_FIELD_CONVERTERS = {
+    "current_price": float,
+    "market_cap": lambda value: int(float(value)) if isinstance(value, (int, float, str)) else value,
+}
+
 def merge_stock_data(default_data, api_data):
     """Merge API data into default data structure, handling type conversions."""
     if not api_data:
@@ -153,14 +151,10 @@ def merge_stock_data(default_data, api_data):
             result[field] = api_data[field]
     
     # Update numeric top-level fields with type conversion
-    for field in ["current_price", "market_cap"]:
+    for field, convert in _NUMERIC_FIELD_CONVERTERS.items():
         if field in api_data:
             try:
-                value = api_data[field]
-                if field == "current_price":
-                    result[field] = float(value)
-                elif field == "market_cap":
-                    result[field] = int(float(value)) if isinstance(value, (int, float, str)) else value
+                result[field] = convert(api_data[field])
             except (ValueError, TypeError):
                 print(f"Failed to convert {field} value: {api_data[field]}")
     
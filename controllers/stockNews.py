@@ -1,11 +1,8 @@
 import finnhub
 import time
 import requests
-import dotenv 
 import os
 
-dotenv.load_dotenv()
-
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
 
 if not NEWS_API_KEY:
@@ -15,11 +12,11 @@ session = requests.Session()
 session.headers.update({
     "User-Agent": "Chrome/122.0.0.0"
 })
+# Shared client so every fetch reuses the same keep-alive connection pool
+finnhub_client = finnhub.Client(api_key=NEWS_API_KEY)
+
 def fetch_news():
     try:
-
-        finnhub_client = finnhub.Client(api_key=NEWS_API_KEY)
-
         news_list =finnhub_client.general_news('general', min_id=4)
         news_stack=[]
         for news in news_list[:10]:
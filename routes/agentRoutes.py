@@ -1,178 +1,121 @@
 import os
 import datetime
-import json
-import requests
+import orjson
+import time
+from functools import lru_cache
 from fastapi import FastAPI, APIRouter, Request, Query
-from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, ORJSONResponse, StreamingResponse
 from agno.agent import RunResponse, Agent
 from agno.models.nebius import Nebius
 from controllers.agents import multi_ai
-import dotenv
 from controllers.ask import chat_agent
+from utils.llmCache import run_agent, stream_agent
+from utils.routeDocs import wants_html, render_route_doc
+from utils.publicIp import public_ip, fetch_public_ip
 
 router = APIRouter()
 
-dotenv.load_dotenv()
 NEBIUS_API_KEY = os.getenv("NEBIUS_API_KEY")
-templates = Jinja2Templates(directory="templates")
+
+# Fixed payload, so the response is serialised once and re-sent as is
+ERROR_QUERY_REQUIRED = ORJSONResponse(content={"error": "Query parameter is required"})
+
+@lru_cache(maxsize=1)
+def _now_iso(second: int) -> str:
+    return datetime.datetime.fromtimestamp(second).isoformat()
+
+def stream_answer(agent, query: str) -> StreamingResponse:
+    """Stream the agent's answer as newline-delimited JSON {"delta": ...} objects."""
+    async def deltas():
+        try:
+            async for delta in stream_agent(agent, query):
+                yield orjson.dumps({"delta": delta}) + b"\n"
+        except Exception as e:
+            yield orjson.dumps({"error": str(e)}) + b"\n"
+    return StreamingResponse(deltas(), media_type="application/x-ndjson")
 
 @router.get("/health", response_class=HTMLResponse)
-async def health_check(request: Request):
-    """Health check endpoint to verify the API server status and connections."""
+async def health_check(request: Request, full: str = None):
+    """Health check endpoint to verify the API server status and connections.
+
+    The IP comes from a background refresh; pass full=1 to look it up live.
+    """
     try:
         response_data = {
             "status": "healthy",
-            "timestamp": datetime.datetime.now().isoformat(),
+            "timestamp": _now_iso(int(time.time())),
             "uptime": "OK",
             "api": {
                 "nebius_api": "connected" if NEBIUS_API_KEY else "not configured",
             },
-            "ip": requests.get('https://api.ipify.org').text,
+            "ip": (await fetch_public_ip() or public_ip()) if full == "1" else public_ip(),
             "services": {
                 "chat": router.url_path_for("chat"),
                 "agent": router.url_path_for("ask"),
             },
         }
 
-        # Check if request is from a browser or format is explicitly set to html
-        accept_header = request.headers.get("accept", "")
-        if "text/html" in accept_header:
-            current_year = datetime.datetime.now().year
-            return templates.TemplateResponse(
-                "route.html",
-                {
-                    "request": request,
-                    "route_path": "/health",
-                    "method": "GET",
-                    "full_path": str(request.url).split("?")[0],
-                    "description": "Health check endpoint to verify the API server status and connections.",
-                    "parameters": [
-                        {"name": "format", "type": "string", "description": "Response format (html or json)"}
-                    ],
-                    "example_query": "",
-                    "example_response": json.dumps(response_data, indent=2),
-                    "current_year": current_year
-                }
+        if wants_html(request):
+            return render_route_doc(
+                request, "/health",
+                example_response=orjson.dumps(response_data, option=orjson.OPT_INDENT_2).decode(),
             )
         
-        return JSONResponse(content=response_data)
+        return ORJSONResponse(content=response_data)
 
     except Exception as e:
         error_response = {
             "status": "unhealthy",
-            "timestamp": datetime.datetime.now().isoformat(),
+            "timestamp": _now_iso(int(time.time())),
             "error": str(e)
         }
         
-        # Check if request is from a browser or format is explicitly set to html
-        accept_header = request.headers.get("accept", "")
-        if "text/html" in accept_header:
-            current_year = datetime.datetime.now().year
-            return templates.TemplateResponse(
-                "route.html",
-                {
-                    "request": request,
-                    "route_path": "/health",
-                    "method": "GET",
-                    "full_path": str(request.url).split("?")[0],
-                    "description": "Health check endpoint to verify the API server status and connections.",
-                    "parameters": [
-                        {"name": "format", "type": "string", "description": "Response format (html or json)"}
-                    ],
-                    "example_query": "",
-                    "example_response": json.dumps(error_response, indent=2),
-                    "current_year": current_year
-                }
+        if wants_html(request):
+            return render_route_doc(
+                request, "/health",
+                example_response=orjson.dumps(error_response, option=orjson.OPT_INDENT_2).decode(),
             )
             
-        return JSONResponse(content=error_response)
+        return ORJSONResponse(content=error_response)
 
 @router.get("/chat", response_class=HTMLResponse)
-def chat(request: Request, query: str = None):
+async def chat(request: Request, query: str = None, stream: str = None):
     """
     API endpoint to handle user investment-related questions and return AI-generated insights.
     """
-    # Check if request is from a browser or format is explicitly set to html
-    accept_header = request.headers.get("accept", "")
-    if "text/html" in accept_header:
-        current_year = datetime.datetime.now().year
-        example_response = {
-            "question": "What are good tech stocks to invest in?",
-            "answer": "Some popular tech stocks to consider include Apple (AAPL), Microsoft (MSFT), Google (GOOGL), and Amazon (AMZN). However, you should always do your own research and consider your investment goals and risk tolerance before investing."
-        }
-        
-        return templates.TemplateResponse(
-            "route.html",
-            {
-                "request": request,
-                "route_path": "/chat",
-                "method": "GET",
-                "full_path": str(request.url).split("?")[0],
-                "description": "Chat endpoint that uses Nebius's LLaMa model to answer investment questions.",
-                "parameters": [
-                    {"name": "query", "type": "string", "description": "The investment question to ask"},
-                    {"name": "format", "type": "string", "description": "Response format (html or json)"}
-                ],
-                "example_query": "What are good tech stocks to invest in?",
-                "example_response": json.dumps(example_response, indent=2),
-                "current_year": current_year
-            }
-        )
+    if wants_html(request):
+        return render_route_doc(request, "/chat")
     
     # Handle regular API calls
     if not query:
-        return JSONResponse(content={"error": "Query parameter is required"})
-    
-    try:
-        response = chat_agent.run(query)
-        answer = response.content
-        return JSONResponse(content={"question": query, "answer": answer})
+        return ERROR_QUERY_REQUIRED
+
+    if stream == "1":
+        return stream_answer(chat_agent, query)
     
-    except Exception as e:
-        return JSONResponse(content={"error": str(e)})
+    answer, cached = await run_agent(chat_agent, query)
+    content = {"question": query, "answer": answer}
+    if cached:
+        content["cached"] = True
+    return ORJSONResponse(content=content)
 
 @router.get("/agent", response_class=HTMLResponse)
-def ask(request: Request, query: str = None):
+async def ask(request: Request, query: str = None, stream: str = None):
     """
     API endpoint to handle user investment-related questions and return AI-generated insights.
     """
-    # Check if request is from a browser or format is explicitly set to html
-    accept_header = request.headers.get("accept", "")
-    if "text/html" in accept_header:
-        current_year = datetime.datetime.now().year
-        example_response = {
-            "question": "Should I invest in index funds?",
-            "answer": "Index funds are often a good choice for passive investors looking for broad market exposure with low fees. They offer diversification and typically outperform actively managed funds in the long term. However, the suitability depends on your investment goals, time horizon, and risk tolerance."
-        }
-        
-        return templates.TemplateResponse(
-            "route.html",
-            {
-                "request": request,
-                "route_path": "/agent",
-                "method": "GET",
-                "full_path": str(request.url).split("?")[0],
-                "description": "Agent endpoint that uses a multi-AI system to provide sophisticated investment advice.",
-                "parameters": [
-                    {"name": "query", "type": "string", "description": "The investment question to ask"},
-                    {"name": "format", "type": "string", "description": "Response format (html or json)"}
-                ],
-                "example_query": "Should I invest in index funds?",
-                "example_response": json.dumps(example_response, indent=2),
-                "current_year": current_year
-            }
-        )
+    if wants_html(request):
+        return render_route_doc(request, "/agent")
     
     # Handle regular API calls
     if not query:
-        return JSONResponse(content={"error": "Query parameter is required"})
-    
-    try:
-        response: RunResponse = multi_ai.run(query)
-        answer = response.content
+        return ERROR_QUERY_REQUIRED
 
-        return JSONResponse(content={"question": query, "answer": answer})
+    if stream == "1":
+        return stream_answer(multi_ai, query)
     
-    except Exception as e:
-        return JSONResponse(content={"error": str(e)})
+    answer, cached = await run_agent(multi_ai, query)
+    content = {"question": query, "answer": answer}
+    if cached:
+        content["cached"] = True
+    return ORJSONResponse(content=content)
@@ -1,26 +1,30 @@
 from fastapi import APIRouter, Depends, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.redis import RedisBackend
 from utils.redisCache import get_cache
+from utils.routeDocs import base_template, wants_html, docs_etag, docs_cache_headers, docs_not_modified, render_route_doc
+from utils.llmCache import run_llm_call
 from controllers.topStocks import get_stock, get_top_stock_info
 from controllers.stockNews import fetch_news
 from controllers.stockAgent import stock_analyzer_agent, extract_json_from_response, create_default_stock_data, merge_stock_data
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import ORJSONResponse, HTMLResponse, Response
 from fastapi import FastAPI, Query, HTTPException
 import os
 import re
-import json
-from fastapi.templating import Jinja2Templates
-import datetime
+import orjson
 
-templates = Jinja2Templates(directory="templates")
 router = APIRouter()
 
 @router.get("/")
 @router.head("/")
 async def read_root(request: Request):
+    etag = docs_etag("/", "base.html")
+    not_modified = docs_not_modified(request, etag)
+    if not_modified:
+        return not_modified
     text = "Investo-glow Backend API Server"
-    return templates.TemplateResponse("base.html",{"request":request, "text": text})
+    return HTMLResponse(base_template.render(request=request, text=text), headers=docs_cache_headers(etag))
 
 
 @router.get("/top-stocks")
@@ -29,26 +33,19 @@ async def read_top_stocks(request: Request, cache: RedisBackend = Depends(get_ca
     cached_result = await cache.get(cache_key)
     
     if cached_result:
-        result = json.loads(cached_result)
+        payload = cached_result
     else:
-        result = get_top_stock_info()
-        await cache.set(cache_key, json.dumps(result), 10)
+        payload = orjson.dumps(await run_in_threadpool(get_top_stock_info))
+        await cache.set(cache_key, payload, 10)
     
-    # Check if request is from a browser
-    accept_header = request.headers.get("accept", "")
-    if "text/html" in accept_header:
-        return templates.TemplateResponse("route.html", {
-            "request": request,
-            "route_path": "/top-stocks",
-            "method": "GET",
-            "full_path": request.url.scheme + "://" + request.url.netloc + "/top-stocks",
-            "description": "Returns information about top stocks in the market",
-            "parameters": [],
-            "example_response": json.dumps(result, indent=2),
-            "current_year": datetime.datetime.now().year
-        })
+    if wants_html(request):
+        return render_route_doc(
+            request, "/top-stocks",
+            example_response=orjson.dumps(orjson.loads(payload), option=orjson.OPT_INDENT_2).decode(),
+        )
     
-    return result
+    # The cached payload is already JSON, so it is sent without re-encoding
+    return Response(payload, media_type="application/json")
 
 @router.get("/stock-news")
 async def stock_news(request: Request, cache: RedisBackend = Depends(get_cache)):
@@ -56,26 +53,18 @@ async def stock_news(request: Request, cache: RedisBackend = Depends(get_cache))
     cached_result = await cache.get(cache_key)
     
     if cached_result:
-        result = json.loads(cached_result)
+        payload = cached_result
     else:
-        result = fetch_news()
-        await cache.set(cache_key, json.dumps(result), 300)
+        payload = orjson.dumps(await run_in_threadpool(fetch_news))
+        await cache.set(cache_key, payload, 300)
     
-    # Check if request is from a browser
-    accept_header = request.headers.get("accept", "")
-    if "text/html" in accept_header:
-        return templates.TemplateResponse("route.html", {
-            "request": request,
-            "route_path": "/stock-news",
-            "method": "GET",
-            "full_path": request.url.scheme + "://" + request.url.netloc + "/stock-news",
-            "description": "Returns latest news articles related to stocks and financial markets",
-            "parameters": [],
-            "example_response": json.dumps(result[:2], indent=2),  # Showing only first 2 news items as example
-            "current_year": datetime.datetime.now().year
-        })
+    if wants_html(request):
+        return render_route_doc(
+            request, "/stock-news",
+            example_response=orjson.dumps(orjson.loads(payload)[:2], option=orjson.OPT_INDENT_2).decode(),  # Showing only first 2 news items as example
+        )
     
-    return result
+    return Response(payload, media_type="application/json")
 
 @router.get("/stock/{symbol}")
 async def read_stock(request: Request, symbol: str, cache: RedisBackend = Depends(get_cache)):
@@ -84,28 +73,19 @@ async def read_stock(request: Request, symbol: str, cache: RedisBackend = Depend
     cached_result = await cache.get(cache_key)
     
     if cached_result:
-        result = json.loads(cached_result)
+        payload = cached_result
     else:
-        result = get_stock(symbol)
-        await cache.set(cache_key, json.dumps(result), 10)
+        payload = orjson.dumps(await run_in_threadpool(get_stock, symbol))
+        await cache.set(cache_key, payload, 10)
     
-    # Check if request is from a browser
-    accept_header = request.headers.get("accept", "")
-    if "text/html" in accept_header:
-        return templates.TemplateResponse("route.html", {
-            "request": request,
-            "route_path": f"/stock/{{{symbol}}}",
-            "method": "GET",
-            "full_path": request.url.scheme + "://" + request.url.netloc + f"/stock/{symbol}",
-            "description": "Returns detailed information about a specific stock",
-            "parameters": [
-                {"name": "symbol", "type": "string", "description": "Stock symbol (e.g., AAPL, MSFT)"}
-            ],
-            "example_response": json.dumps(result, indent=2),
-            "current_year": datetime.datetime.now().year
-        })
+    if wants_html(request):
+        return render_route_doc(
+            request, "/stock/{symbol}",
+            route_path=f"/stock/{{{symbol}}}",
+            example_response=orjson.dumps(orjson.loads(payload), option=orjson.OPT_INDENT_2).decode(),
+        )
     
-    return result
+    return Response(payload, media_type="application/json")
 
 @router.get("/stock-analysis/{symbol}")
 async def get_stock_analysis(request: Request, symbol: str, cache: RedisBackend = Depends(get_cache)):
@@ -118,11 +98,11 @@ async def get_stock_analysis(request: Request, symbol: str, cache: RedisBackend
         # Get or compute result
         cached_result = await cache.get(cache_key)
         if cached_result:
-            result = json.loads(cached_result)
+            payload = cached_result
         else:
             # Construct a clear prompt for the model
             prompt = f"Analyze the stock {symbol} and provide detailed financial information following the specified JSON format."
-            response = stock_analyzer_agent.run(prompt)
+            response = await run_llm_call(stock_analyzer_agent, prompt)
             
             # Extract JSON from the response
             if hasattr(response, 'content'):
@@ -138,44 +118,27 @@ async def get_stock_analysis(request: Request, symbol: str, cache: RedisBackend
             else:
                 result = create_default_stock_data(symbol)
                 
-            await cache.set(cache_key, json.dumps(result), 300)
+            payload = orjson.dumps(result)
+            await cache.set(cache_key, payload, 300)
         
-        # Check if request is from a browser
-        accept_header = request.headers.get("accept", "")
-        if "text/html" in accept_header:
-            return templates.TemplateResponse("route.html", {
-                "request": request,
-                "route_path": f"/stock-analysis/{{{symbol}}}",
-                "method": "GET",
-                "full_path": request.url.scheme + "://" + request.url.netloc + f"/stock-analysis/{symbol}",
-                "description": "Provides detailed AI-powered analysis of a stock, including financial metrics and predictions",
-                "parameters": [
-                    {"name": "symbol", "type": "string", "description": "Stock symbol to analyze (e.g., AAPL, MSFT)"}
-                ],
-                "example_response": json.dumps(result, indent=2),
-                "current_year": datetime.datetime.now().year
-            })
+        if wants_html(request):
+            return render_route_doc(
+                request, "/stock-analysis/{symbol}",
+                route_path=f"/stock-analysis/{{{symbol}}}",
+                example_response=orjson.dumps(orjson.loads(payload), option=orjson.OPT_INDENT_2).decode(),
+            )
         
-        return JSONResponse(content=result)
+        return Response(payload, media_type="application/json")
         
     except Exception as e:
         error_response = {"error": f"Failed to retrieve stock data: {str(e)}"}
         
-        # Check if request is from a browser for error case
-        accept_header = request.headers.get("accept", "")
-        if "text/html" in accept_header:
-            return templates.TemplateResponse("route.html", {
-                "request": request,
-                "route_path": f"/stock-analysis/{{{symbol}}}",
-                "method": "GET",
-                "full_path": request.url.scheme + "://" + request.url.netloc + f"/stock-analysis/{symbol}",
-                "description": "Provides detailed AI-powered analysis of a stock, including financial metrics and predictions",
-                "parameters": [
-                    {"name": "symbol", "type": "string", "description": "Stock symbol to analyze (e.g., AAPL, MSFT)"}
-                ],
-                "example_response": json.dumps(error_response, indent=2),
-                "current_year": datetime.datetime.now().year
-            })
+        if wants_html(request):
+            return render_route_doc(
+                request, "/stock-analysis/{symbol}",
+                route_path=f"/stock-analysis/{{{symbol}}}",
+                example_response=orjson.dumps(error_response, option=orjson.OPT_INDENT_2).decode(),
+            )
             
-        return JSONResponse(status_code=500, content=error_response)
+        return ORJSONResponse(status_code=500, content=error_response)
 
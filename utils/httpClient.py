@@ -0,0 +1,15 @@
+import httpx
+
+# Shared async client for outbound calls made from request handlers.
+# One retry covers a pooled keep-alive connection the server already dropped.
+# httpx ignores client-level limits once a transport is given, so they go here.
+http_client = httpx.AsyncClient(
+    timeout=2.0,
+    transport=httpx.AsyncHTTPTransport(
+        retries=1,
+        limits=httpx.Limits(max_keepalive_connections=10),
+    ),
+)
+
+async def close_http_clients():
+    await http_client.aclose()
@@ -0,0 +1,180 @@
+import asyncio
+import hashlib
+import os
+import threading
+from cachetools import TTLCache
+from starlette.concurrency import run_in_threadpool, iterate_in_threadpool
+
+MAX_SIZE = 1024
+# Agents answer with live market data, so answers are only reused for a few minutes
+TTL = 300
+MAX_CONCURRENT_LLM = int(os.getenv("MAX_CONCURRENT_LLM", "8"))
+
+
+class LLMCache:
+    """In-memory TTL cache for agent answers, keyed by agent name, model, instructions and query."""
+
+    def __init__(self, max_size: int = MAX_SIZE, ttl: int = TTL):
+        self._store = TTLCache(maxsize=max_size, ttl=ttl)
+        # TTLCache is not thread-safe and is also used from threadpool workers
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return query.strip().lower()
+
+    def _key(self, agent: str, model: str, query: str, system: str = None) -> bytes:
+        # The user query goes last so NUL bytes in it cannot shift the other fields
+        h = hashlib.blake2b(digest_size=16)
+        h.update(agent.encode())
+        h.update(b"\x00")
+        h.update(model.encode())
+        h.update(b"\x00")
+        if system:
+            h.update(system.encode())
+        h.update(b"\x00")
+        h.update(self.normalize(query).encode())
+        return h.digest()
+
+    def get(self, agent: str, model: str, query: str, system: str = None):
+        key = self._key(agent, model, query, system)
+        with self._lock:
+            return self._store.get(key)
+
+    def set(self, agent: str, model: str, query: str, response, system: str = None):
+        # An empty answer would otherwise be served as a cache hit for the whole TTL
+        if not response:
+            return
+        key = self._key(agent, model, query, system)
+        with self._lock:
+            self._store[key] = response
+
+
+def agent_cache_params(agent):
+    """Return the (agent, model, system) triple identifying an agent's answers in the cache."""
+    # Model and instructions alone do not tell agents apart (multi_ai has no
+    # instructions, and its team and tools are not part of the key)
+    if not agent.name:
+        raise ValueError("Cached agents need a name")
+    instructions = agent.instructions
+    if isinstance(instructions, list):
+        instructions = "\n".join(instructions)
+    return agent.name, agent.model.id, instructions
+
+
+llm_cache = LLMCache()
+
+# Bounds how many blocking agent runs occupy threadpool workers at once
+_llm_semaphore = asyncio.Semaphore(MAX_CONCURRENT_LLM)
+
+class AgentError(Exception):
+    """An agent run failed; its message is safe to return to the client."""
+
+
+async def run_llm_call(agent, *args):
+    """Run agent.run(*args) in the threadpool, at most MAX_CONCURRENT_LLM at a time.
+
+    agno Agents keep per-run state on the instance (run_response, stream, ...),
+    so each call runs on its own copy rather than on the shared agent.
+    Failures are raised as AgentError.
+    """
+    async with _llm_semaphore:
+        try:
+            return await run_in_threadpool(agent.deep_copy().run, *args)
+        except Exception as e:
+            raise AgentError(str(e)) from e
+
+
+# Agent runs currently in progress, keyed like llm_cache entries
+_INFLIGHT: dict[bytes, asyncio.Future] = {}
+
+
+async def run_agent(agent, query: str) -> tuple[str, bool]:
+    """Answer query with agent, serving repeats from llm_cache and joining identical in-flight runs.
+
+    Returns the answer and whether it came from the cache.
+    """
+    name, model_id, system = agent_cache_params(agent)
+    answer = llm_cache.get(name, model_id, query, system)
+    if answer is not None:
+        return answer, True
+
+    key = llm_cache._key(name, model_id, query, system)
+    fut = _INFLIGHT.get(key)
+    if fut is not None:
+        answer = await asyncio.shield(fut)
+        if answer is None:
+            # The leading request was cancelled; run the query ourselves
+            return await run_agent(agent, query)
+        return answer, False
+
+    fut = asyncio.get_running_loop().create_future()
+    _INFLIGHT[key] = fut
+    try:
+        response = await run_llm_call(agent, query)
+        answer = response.content
+        llm_cache.set(name, model_id, query, answer, system)
+        fut.set_result(answer)
+        return answer, False
+    except asyncio.CancelledError:
+        # Only this caller was cancelled, so followers must not see a CancelledError
+        _INFLIGHT.pop(key, None)
+        fut.set_result(None)
+        raise
+    except Exception as e:
+        fut.set_exception(e)
+        # Mark the exception as retrieved in case no other caller was waiting
+        fut.exception()
+        raise
+    finally:
+        if _INFLIGHT.get(key) is fut:
+            del _INFLIGHT[key]
+
+
+# Marks the end of a stream in stream_agent's chunk queue
+_END = object()
+
+
+async def stream_agent(agent, query: str):
+    """Yield the answer to query in chunks as the agent generates it.
+
+    A cached answer is yielded whole; a completed, non-empty stream is added to llm_cache.
+    """
+    name, model_id, system = agent_cache_params(agent)
+    answer = llm_cache.get(name, model_id, query, system)
+    if answer is not None:
+        yield answer
+        return
+
+    # agno records stream=True on the agent itself, so each stream runs on its own copy
+    streamer = agent.deep_copy()
+    chunks = asyncio.Queue()
+
+    async def produce():
+        # Generation holds the LLM slot only until the model is done, never
+        # while the client is slow to read what has been produced
+        try:
+            async with _llm_semaphore:
+                async for chunk in iterate_in_threadpool(streamer.run(query, stream=True)):
+                    if chunk.content:
+                        chunks.put_nowait(chunk.content)
+        except Exception as e:
+            chunks.put_nowait(e)
+        finally:
+            chunks.put_nowait(_END)
+
+    producer = asyncio.create_task(produce())
+    parts = []
+    try:
+        while True:
+            item = await chunks.get()
+            if item is _END:
+                break
+            if isinstance(item, Exception):
+                raise item
+            parts.append(item)
+            yield item
+    finally:
+        producer.cancel()
+
+    llm_cache.set(name, model_id, query, "".join(parts), system)
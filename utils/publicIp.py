@@ -0,0 +1,37 @@
+import asyncio
+import httpx
+from utils.httpClient import http_client
+
+PUBLIC_IP_URL = "https://api.ipify.org"
+# How often the background task refreshes the public IP reported by /health
+PUBLIC_IP_REFRESH = 300
+
+_public_ip = None
+
+async def fetch_public_ip():
+    """Look up the server's public IP, updating the cached value. Returns None on failure."""
+    global _public_ip
+    try:
+        resp = await http_client.get(PUBLIC_IP_URL)
+        resp.raise_for_status()
+        _public_ip = resp.text
+    except httpx.HTTPError as e:
+        print(f"❌ Error fetching public IP: {e}")
+        return None
+    return _public_ip
+
+def public_ip():
+    """Last public IP fetched, without any network I/O."""
+    return _public_ip
+
+async def _refresh_public_ip():
+    while True:
+        try:
+            await fetch_public_ip()
+        except Exception as e:
+            # Keep refreshing; an unexpected error must not silently end the task
+            print(f"❌ Public IP refresh failed: {e}")
+        await asyncio.sleep(PUBLIC_IP_REFRESH)
+
+def start_public_ip_refresh() -> asyncio.Task:
+    return asyncio.create_task(_refresh_public_ip())
@@ -1,27 +1,75 @@
 from fastapi_cache.backends.redis import RedisBackend
-from contextlib import asynccontextmanager
+from fastapi_cache.types import Backend
+from cachetools import TLRUCache
+from contextlib import asynccontextmanager, suppress
+import asyncio
 from redis import asyncio as aioredis
 from fastapi_cache import FastAPICache
 from fastapi import FastAPI
+from utils.httpClient import close_http_clients
+from utils.publicIp import start_public_ip_refresh
 import os
-import dotenv
-
-dotenv.load_dotenv()
 
 REDIS_URL = os.getenv("REDIS_URL")
+# Cache keys include user-supplied symbols, so the in-memory fallback is capped
+MEMORY_CACHE_SIZE = 1024
+
+
+class MemoryBackend(Backend):
+    """Bounded in-process fastapi-cache backend, used when Redis is unavailable.
+
+    Entries expire after their own expire seconds, and the least recently
+    used ones are evicted once MEMORY_CACHE_SIZE is reached.
+    """
+
+    def __init__(self, max_size: int = MEMORY_CACHE_SIZE):
+        # Values are (data, expires_at); entries without expire never expire on their own
+        self._store = TLRUCache(maxsize=max_size, ttu=lambda _key, value, _now: value[1])
+
+    async def get_with_ttl(self, key: str):
+        item = self._store.get(key)
+        if item is None:
+            return 0, None
+        return int(item[1] - self._store.timer()), item[0]
+
+    async def get(self, key: str):
+        item = self._store.get(key)
+        return item[0] if item else None
+
+    async def set(self, key: str, value, expire: int = None):
+        expires_at = self._store.timer() + expire if expire else float("inf")
+        self._store[key] = (value, expires_at)
+
+    async def clear(self, namespace: str = None, key: str = None) -> int:
+        if namespace:
+            keys = [k for k in list(self._store.keys()) if k.startswith(namespace)]
+        elif key:
+            keys = [key] if key in self._store else []
+        else:
+            keys = list(self._store.keys())
+        for k in keys:
+            self._store.pop(k, None)
+        return len(keys)
+
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     redis_client = None  
+    ip_refresh = start_public_ip_refresh()
 
     try:
-        redis_client = aioredis.from_url(REDIS_URL, encoding="utf-8", decode_responses=True)
+        redis_client = aioredis.from_url(REDIS_URL, encoding="utf-8", decode_responses=True, socket_connect_timeout=5)
+        # from_url() connects lazily, so check the server is actually reachable
+        await redis_client.ping()
         FastAPICache.init(RedisBackend(redis_client), prefix="fastapi-cache")
         print("✅ Redis cache initialized successfully!")
         yield
         
     except Exception as e:
         print(f"❌ Redis Connection Error: {e}")
+        # Keep the cached routes working from process memory instead of failing on every request
+        FastAPICache.init(MemoryBackend(), prefix="fastapi-cache")
+        print("⚠️ Falling back to in-memory cache")
         yield 
     finally:
         try:
@@ -31,6 +79,10 @@ async def lifespan(_: FastAPI):
                 print("🔴 Redis connection closed!")
         except Exception as e:
             print(f"❌ Error while closing Redis: {e}")
+        ip_refresh.cancel()
+        with suppress(asyncio.CancelledError):
+            await ip_refresh
+        await close_http_clients()
 
 def get_cache():
     return FastAPICache.get_backend()
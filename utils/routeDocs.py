@@ -0,0 +1,183 @@
+import datetime
+import hashlib
+import os
+import time
+from functools import lru_cache
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import HTMLResponse
+from fastapi.templating import Jinja2Templates
+
+TEMPLATES_DIR = "templates"
+DOCS_MAX_AGE = 60
+
+# One Jinja environment for every router, so compiled templates are shared
+templates = Jinja2Templates(directory=TEMPLATES_DIR)
+# Templates only change on deploy, so skip the per-lookup mtime check
+templates.env.auto_reload = False
+route_template = templates.get_template("route.html")
+base_template = templates.get_template("base.html")
+
+# Part of every docs ETag, so a restart (and thus a deploy) invalidates them
+_STARTED_AT = time.time()
+
+# Static parts of the HTML docs pages, built once at import
+ROUTE_DOCS = {
+    "/health": {
+        "route_path": "/health",
+        "method": "GET",
+        "description": "Health check endpoint to verify the API server status and connections.",
+        "parameters": (
+            {"name": "full", "type": "string", "description": "Set to 1 to look up the public IP live"},
+            {"name": "format", "type": "string", "description": "Response format (html or json)"},
+        ),
+        "example_query": "",
+    },
+    "/chat": {
+        "route_path": "/chat",
+        "method": "GET",
+        "description": "Chat endpoint that uses Nebius's LLaMa model to answer investment questions.",
+        "parameters": (
+            {"name": "query", "type": "string", "description": "The investment question to ask"},
+            {"name": "stream", "type": "string", "description": "Set to 1 to stream the answer as newline-delimited JSON"},
+            {"name": "format", "type": "string", "description": "Response format (html or json)"},
+        ),
+        "example_query": "What are good tech stocks to invest in?",
+        "example_response": orjson.dumps({
+            "question": "What are good tech stocks to invest in?",
+            "answer": "Some popular tech stocks to consider include Apple (AAPL), Microsoft (MSFT), Google (GOOGL), and Amazon (AMZN). However, you should always do your own research and consider your investment goals and risk tolerance before investing."
+        }, option=orjson.OPT_INDENT_2).decode(),
+    },
+    "/agent": {
+        "route_path": "/agent",
+        "method": "GET",
+        "description": "Agent endpoint that uses a multi-AI system to provide sophisticated investment advice.",
+        "parameters": (
+            {"name": "query", "type": "string", "description": "The investment question to ask"},
+            {"name": "stream", "type": "string", "description": "Set to 1 to stream the answer as newline-delimited JSON"},
+            {"name": "format", "type": "string", "description": "Response format (html or json)"},
+        ),
+        "example_query": "Should I invest in index funds?",
+        "example_response": orjson.dumps({
+            "question": "Should I invest in index funds?",
+            "answer": "Index funds are often a good choice for passive investors looking for broad market exposure with low fees. They offer diversification and typically outperform actively managed funds in the long term. However, the suitability depends on your investment goals, time horizon, and risk tolerance."
+        }, option=orjson.OPT_INDENT_2).decode(),
+    },
+    "/top-stocks": {
+        "route_path": "/top-stocks",
+        "method": "GET",
+        "description": "Returns information about top stocks in the market",
+        "parameters": (),
+    },
+    "/stock-news": {
+        "route_path": "/stock-news",
+        "method": "GET",
+        "description": "Returns latest news articles related to stocks and financial markets",
+        "parameters": (),
+    },
+    "/stock/{symbol}": {
+        "method": "GET",
+        "description": "Returns detailed information about a specific stock",
+        "parameters": (
+            {"name": "symbol", "type": "string", "description": "Stock symbol (e.g., AAPL, MSFT)"},
+        ),
+    },
+    "/stock-analysis/{symbol}": {
+        "method": "GET",
+        "description": "Provides detailed AI-powered analysis of a stock, including financial metrics and predictions",
+        "parameters": (
+            {"name": "symbol", "type": "string", "description": "Stock symbol to analyze (e.g., AAPL, MSFT)"},
+        ),
+    },
+}
+
+
+@lru_cache(maxsize=1)
+def _year_for_day(day: int) -> int:
+    # Derived from the key itself, so the cached year always matches the UTC day
+    return datetime.datetime.fromtimestamp(day * 86400, datetime.timezone.utc).year
+
+def current_year() -> int:
+    """Year (UTC) shown in the HTML docs footer, recomputed at most once a day."""
+    return _year_for_day(int(time.time() // 86400))
+
+@lru_cache(maxsize=128)
+def _prefers_html(accept: str) -> bool:
+    qualities = {}
+    for media_range in accept.split(","):
+        media_type, _, params = media_range.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[media_type.strip().lower()] = q
+
+    html_q = qualities.get("text/html", 0.0)
+    json_q = qualities.get("application/json", qualities.get("application/*", qualities.get("*/*", 0.0)))
+    return html_q > 0 and html_q >= json_q
+
+def wants_html(request: Request) -> bool:
+    """True when the client (typically a browser) prefers an HTML docs page over JSON."""
+    accept = request.headers.get("accept", "")
+    # Browsers send only a handful of distinct Accept headers, so parses are cached
+    return "text/html" in accept and _prefers_html(accept)
+
+@lru_cache(maxsize=64)
+def _docs_etag(route_path: str, template: str, year: int) -> str:
+    mtime = os.path.getmtime(os.path.join(TEMPLATES_DIR, template))
+    seed = f"{route_path}|{year}|{mtime}|{_STARTED_AT}"
+    return f'W/"{hashlib.blake2b(seed.encode(), digest_size=8).hexdigest()}"'
+
+def docs_etag(route_path: str, template: str = "route.html") -> str:
+    """Weak ETag for a static HTML docs page."""
+    return _docs_etag(route_path, template, current_year())
+
+def docs_cache_headers(etag: str) -> dict:
+    # The same URL also serves JSON, so shared caches must key on Accept
+    return {"ETag": etag, "Cache-Control": f"public, max-age={DOCS_MAX_AGE}", "Vary": "Accept"}
+
+def docs_not_modified(request: Request, etag: str):
+    """Return a 304 response if the client already holds this docs page, otherwise None."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    if "*" in tags or etag in tags:
+        return Response(status_code=304, headers=docs_cache_headers(etag))
+    return None
+
+@lru_cache(maxsize=64)
+def _static_route_doc(route_key: str, full_path: str, year: int) -> bytes:
+    return route_template.render({
+        **ROUTE_DOCS[route_key],
+        "full_path": full_path,
+        "current_year": year,
+    }).encode()
+
+def render_route_doc(request: Request, route_key: str, **context):
+    """Render the route.html docs page for route_key.
+
+    Keyword arguments carry per-request values such as a live example_response.
+    Pages rendered without them are static: they are built once and revalidated by ETag.
+    """
+    full_path = str(request.url).partition("?")[0]
+    if not context:
+        etag = docs_etag(route_key)
+        not_modified = docs_not_modified(request, etag)
+        if not_modified:
+            return not_modified
+        body = _static_route_doc(route_key, full_path, current_year())
+        return HTMLResponse(body, headers=docs_cache_headers(etag))
+
+    html = route_template.render({
+        **ROUTE_DOCS[route_key],
+        "request": request,
+        "full_path": full_path,
+        "current_year": current_year(),
+        **context,
+    })
+    return HTMLResponse(html)